@@ -0,0 +1,76 @@
+"""
+Benchmark the NumPy batch scorer against per-conversation scoring.
+
+    python -m benchmarks.bench_batch_scoring [--conversations 100000] [--repeat 3]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.app.services.batch_scoring import batch_risk_scores, batch_risk_tiers, flag_count_matrix
+from src.app.services.risk_engine import FLAG_IDS, calculate_risk_score, determine_risk_tier, flag_severity
+
+
+def _random_detections(n, rng):
+    counts = rng.integers(0, 5, size=(n, len(FLAG_IDS))) * (rng.random((n, len(FLAG_IDS))) < 0.12)
+    detections = []
+    for row in counts:
+        detected = {}
+        for col in np.flatnonzero(row):
+            category, flag = FLAG_IDS[col]
+            detected.setdefault(category, {})[flag] = {'count': int(row[col])}
+        detections.append(detected)
+    return detections, rng.integers(1, 30, size=n)
+
+
+def score_each(detections, message_counts):
+    tiers = []
+    for detected, message_count in zip(detections, message_counts):
+        context = {
+            'message_count': int(message_count),
+            'financial_flags_count': sum(d['count'] for d in detected.get('financial', {}).values()),
+        }
+        score = calculate_risk_score(detected, context)
+        red_flags_list = [
+            {'type': flag, 'category': category, 'severity': flag_severity(category, flag)}
+            for category, flags in detected.items() for flag in flags
+        ]
+        tiers.append(determine_risk_tier(score, red_flags_list)['tier'])
+    return tiers
+
+
+def score_batch(counts, message_counts):
+    scores = batch_risk_scores(counts, message_counts)
+    return batch_risk_tiers(scores, counts)['tier']
+
+
+def _best_of(fn, *args, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--conversations', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    detections, message_counts = _random_detections(args.conversations, np.random.default_rng(0))
+    counts = flag_count_matrix(detections)
+    assert list(score_batch(counts, message_counts)) == score_each(detections, message_counts)
+
+    each = _best_of(score_each, detections, message_counts, repeat=args.repeat)
+    batch = _best_of(score_batch, counts, message_counts, repeat=args.repeat)
+    print(f"conversations={args.conversations}")
+    print(f"per-conversation : {each * 1000:8.1f} ms")
+    print(f"batch            : {batch * 1000:8.1f} ms")
+    print(f"speedup          : {each / batch:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark detect_red_flags against the original per-keyword substring loop.
+
+    python -m benchmarks.bench_red_flags [--turns 5000] [--repeat 5]
+"""
+import argparse
+import random
+import re
+import time
+
+from src.app.services.risk_engine import RED_FLAG_PATTERNS, detect_red_flags
+
+
+SAMPLE_MESSAGES = [
+    "Hello dear, how was your day?",
+    "I'm a soldier deployed overseas, the camera is broken so no video call",
+    "My love, you are my soulmate and destiny",
+    "I need cash urgently, please send money today via wire transfer",
+    "안녕하세요 오늘 날씨 좋네요",
+    "거래소에 입금하고 시키는대로 하세요. 수익 보장 고수익 코인 리딩방",
+    "급히 돈 보내주세요. 30분 안에 보증금 이체 필요해요",
+    "Buy some google play gift card, itunes is fine too",
+    "Earn $300/day, just pay the registration fee within 1 hour",
+    "Send to 0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb now",
+    "we went to the park and had coffee, see you on saturday",
+    "택배 배송 보류 안내: bit.ly/abc123 에서 관세 납부",
+]
+
+
+def legacy_detect_red_flags(messages):
+    detected = {}
+    for msg in messages:
+        content = msg.get('content') or msg.get('text') or ''
+        lowered = content.lower()
+        for category, flags in RED_FLAG_PATTERNS.items():
+            for flag, spec in flags.items():
+                count = 0
+                if 'keywords' in spec:
+                    for kw in spec['keywords']:
+                        if kw in lowered:
+                            count += 1
+                if 'regex' in spec:
+                    if re.search(spec['regex'], content, flags=re.IGNORECASE):
+                        count += 1
+                if count > 0:
+                    detected.setdefault(category, {}).setdefault(flag, {"count": 0})
+                    detected[category][flag]["count"] += count
+    return detected
+
+
+def _best_of(fn, messages, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(messages)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--turns', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    messages = [{'sender': 'contact', 'content': rng.choice(SAMPLE_MESSAGES)} for _ in range(args.turns)]
+
+    assert detect_red_flags(messages) == legacy_detect_red_flags(messages)
+
+    legacy = _best_of(legacy_detect_red_flags, messages, args.repeat)
+    current = _best_of(detect_red_flags, messages, args.repeat)
+    print(f"turns={args.turns}")
+    print(f"legacy loop : {legacy * 1000:8.1f} ms ({legacy / args.turns * 1e6:.1f} us/message)")
+    print(f"automaton   : {current * 1000:8.1f} ms ({current / args.turns * 1e6:.1f} us/message)")
+    print(f"speedup     : {legacy / current:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, HTTPException, Header
-from pydantic import BaseModel, Field
-from typing import List, Literal, Optional
+from fastapi import APIRouter, HTTPException, Header, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import AsyncIterator, List, Literal, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
+import threading
 import time
 import os
 
 from ..services.preprocess import preprocess_text
-from ..services.risk_engine import detect_red_flags, calculate_risk_score, determine_risk_tier
+from ..services.features import extract_features
+from ..services.risk_engine import detect_red_flags, calculate_risk_score, determine_risk_tier, flag_severity
 from ..services.gemini_client import analyze_with_gemini
 from ..services.context_analyzer import analyze_conversation_context, calculate_context_risk_boost
 from ..services.entity_validator import detect_inconsistencies, calculate_entity_risk_boost
@@ -18,6 +24,10 @@ from ..utils.translations import FLAG_TYPE_KO
 
 router = APIRouter()
 
+# Batch analysis: worker threads, and the longest NDJSON line accepted
+BATCH_WORKERS = int(os.getenv('ANALYZE_BATCH_WORKERS', '4'))
+BATCH_MAX_LINE_BYTES = int(os.getenv('ANALYZE_BATCH_MAX_LINE_BYTES', str(1 << 20)))
+
 
 class Message(BaseModel):
     message_id: str
@@ -95,30 +105,33 @@ def analyze(body: AnalyzeRequest):
         'timestamp': m.timestamp,
     } for m in body.messages]
 
-    detected = detect_red_flags(msgs)
+    # Featurize every message once; all analyzers below read these records
+    features = extract_features(body.messages)
+
+    detected = detect_red_flags(msgs, features)
     
     # Analyze conversation flow and temporal patterns
-    context_analysis = analyze_conversation_context(body.messages)
+    context_analysis = analyze_conversation_context(body.messages, features)
     context_boost = calculate_context_risk_boost(context_analysis)
     
     # Validate entity consistency
-    entity_validation = detect_inconsistencies(body.messages)
+    entity_validation = detect_inconsistencies(body.messages, features)
     entity_boost = calculate_entity_risk_boost(entity_validation)
     
     # Analyze emotional manipulation
-    sentiment_analysis = analyze_emotional_manipulation(body.messages)
+    sentiment_analysis = analyze_emotional_manipulation(body.messages, features)
     sentiment_boost = calculate_emotional_risk_boost(sentiment_analysis)
     
     # Analyze money amount patterns
-    money_analysis = analyze_money_patterns(body.messages)
+    money_analysis = analyze_money_patterns(body.messages, features)
     money_boost = calculate_money_pattern_risk_boost(money_analysis)
     
     # Detect scam sequence pattern
-    sequence_analysis = detect_scam_sequence(body.messages)
+    sequence_analysis = detect_scam_sequence(body.messages, features)
     sequence_boost = calculate_sequence_risk_boost(sequence_analysis)
     
     # Analyze language style
-    style_analysis = analyze_language_style(body.messages)
+    style_analysis = analyze_language_style(body.messages, features)
     style_boost = calculate_style_risk_boost(style_analysis)
 
     conversation_context = {
@@ -138,7 +151,7 @@ def analyze(body: AnalyzeRequest):
     red_flags_list = []
     for category, flags in detected.items():
         for flag_type, details in flags.items():
-            severity = 'severe' if category == 'financial' and flag_type in ('direct_money_request', 'gift_card_request') else 'moderate'
+            severity = flag_severity(category, flag_type)
             red_flags_list.append({
                 'type': flag_type,
                 'type_ko': FLAG_TYPE_KO.get(flag_type, flag_type.replace('_', ' ')),
@@ -262,3 +275,133 @@ def analyze_text(body: AnalyzeTextRequest, x_gemini_key: str | None = Header(def
     return analyze(req)
 
 
+
+
+_batch_executor: Optional[ThreadPoolExecutor] = None
+_batch_executor_lock = threading.Lock()
+
+
+def _get_batch_executor() -> ThreadPoolExecutor:
+    global _batch_executor
+    if _batch_executor is None:
+        with _batch_executor_lock:
+            if _batch_executor is None:
+                _batch_executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix='analyze-batch')
+    return _batch_executor
+
+
+async def _iter_ndjson_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a byte stream into ``(line_number, line)`` pairs without holding
+    more than one line in memory. Lines longer than ``max_line_bytes`` are
+    skipped and reported as ``None``.
+    """
+    buf = bytearray()
+    overflow = False
+    line_no = 0
+    async for chunk in chunks:
+        pos = 0
+        while True:
+            nl = chunk.find(b'\n', pos)
+            piece = chunk[pos:] if nl < 0 else chunk[pos:nl]
+            if not overflow:
+                if len(buf) + len(piece) > max_line_bytes:
+                    overflow = True
+                    buf.clear()
+                else:
+                    buf += piece
+            if nl < 0:
+                break
+            pos = nl + 1
+            line_no += 1
+            yield line_no, None if overflow else bytes(buf)
+            buf.clear()
+            overflow = False
+    if buf or overflow:
+        yield line_no + 1, None if overflow else bytes(buf)
+
+
+def _analyze_batch_line(line_no: int, raw: Optional[bytes]) -> str:
+    """
+    Analyze one NDJSON line and return the serialized result line. Errors
+    are reported in the line instead of being raised.
+    """
+    item = {'line': line_no, 'conversation_id': None}
+    if raw is None:
+        item.update(status=413, error=f'line exceeds {BATCH_MAX_LINE_BYTES} bytes')
+        return json.dumps(item, ensure_ascii=False) + '\n'
+    try:
+        body = AnalyzeRequest.model_validate_json(raw)
+    except ValidationError as e:
+        try:
+            item['conversation_id'] = json.loads(raw).get('conversation_id')
+        except Exception:
+            pass
+        item.update(status=422, error=json.loads(e.json()))
+        return json.dumps(item, ensure_ascii=False) + '\n'
+
+    item['conversation_id'] = body.conversation_id
+    try:
+        item.update(status=200, result=analyze(body))
+    except HTTPException as e:
+        item.update(status=e.status_code, error=e.detail)
+    except Exception as e:
+        item.update(status=500, error=f'{type(e).__name__}: {e}')
+    return json.dumps(item, ensure_ascii=False) + '\n'
+
+
+async def _stream_batch(request: Request) -> AsyncIterator[str]:
+    loop = asyncio.get_running_loop()
+    executor = _get_batch_executor()
+    # At most `limit` conversations are parsed, running or waiting to be sent;
+    # the upload is only read further once one of them has been written out.
+    limit = BATCH_WORKERS * 2
+    slots = asyncio.Semaphore(limit)
+    results: asyncio.Queue = asyncio.Queue(maxsize=limit)
+    tasks = set()
+
+    async def run(line_no, raw):
+        try:
+            out = await loop.run_in_executor(executor, _analyze_batch_line, line_no, raw)
+            await results.put(out)
+        finally:
+            slots.release()
+
+    async def feed():
+        try:
+            async for line_no, raw in _iter_ndjson_lines(request.stream(), BATCH_MAX_LINE_BYTES):
+                if raw is not None and not raw.strip():
+                    continue
+                await slots.acquire()
+                task = asyncio.ensure_future(run(line_no, raw))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except Exception as e:
+            await results.put(json.dumps({'line': None, 'conversation_id': None, 'status': 400,
+                                          'error': f'{type(e).__name__}: {e}'}) + '\n')
+        await results.put(None)
+
+    feeder = asyncio.ensure_future(feed())
+    try:
+        while True:
+            out = await results.get()
+            if out is None:
+                break
+            yield out
+    finally:
+        feeder.cancel()
+        for task in list(tasks):
+            task.cancel()
+
+
+@router.post("/analyze_batch")
+async def analyze_batch(request: Request):
+    """
+    Analyze many conversations in one request. The body is NDJSON, one
+    AnalyzeRequest per line; results stream back as NDJSON in completion
+    order, each tagged with its line number and conversation_id. A line that
+    fails carries ``status`` and ``error`` instead of ``result``.
+    """
+    return StreamingResponse(_stream_batch(request), media_type='application/x-ndjson')
@@ -0,0 +1,154 @@
+"""
+Vectorized risk scoring for many conversations at once.
+
+Conversations are rows of an (N x F) flag-count matrix whose columns follow
+``risk_engine.FLAG_IDS``. Every rule of ``calculate_risk_score`` and
+``determine_risk_tier`` is applied as array operations, in the same order and
+with the same float64 arithmetic, so each row gives exactly the result of the
+per-conversation functions.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+from .risk_engine import FLAG_IDS, RED_FLAG_PATTERNS, SEVERE_FLAGS
+
+
+TIERS = np.array(['low', 'medium', 'high'])
+LOW, MEDIUM, HIGH = 0, 1, 2
+
+FLAG_COLUMNS = {flag: col for col, (_, flag) in enumerate(FLAG_IDS)}
+FLAG_WEIGHTS = np.array([RED_FLAG_PATTERNS[category][flag]['weight'] for category, flag in FLAG_IDS])
+
+CATEGORIES = list(RED_FLAG_PATTERNS)
+# (F x C) one-hot map from flag column to category
+_CATEGORY_MAP = np.array([[category == c for c in CATEGORIES] for category, _ in FLAG_IDS])
+_FINANCIAL = np.array([category == 'financial' for category, _ in FLAG_IDS])
+_BEHAVIORAL = np.array([category == 'behavioral' for category, _ in FLAG_IDS])
+_SEVERE = np.array([(category, flag) in SEVERE_FLAGS for category, flag in FLAG_IDS])
+
+
+def flag_count_matrix(detections: Iterable[Dict]) -> np.ndarray:
+    """
+    Stack ``detect_red_flags`` results into an (N x F) int64 count matrix.
+    """
+    rows = []
+    for detected in detections:
+        row = [0] * len(FLAG_IDS)
+        for flags in detected.values():
+            for flag, details in flags.items():
+                row[FLAG_COLUMNS[flag]] = details['count']
+        rows.append(row)
+    return np.array(rows, dtype=np.int64).reshape(len(rows), len(FLAG_IDS))
+
+
+def _any(present: np.ndarray, flags: Sequence[str]) -> np.ndarray:
+    return present[:, [FLAG_COLUMNS[f] for f in flags]].any(axis=1)
+
+
+def batch_risk_scores(
+    counts: np.ndarray,
+    message_counts: np.ndarray,
+    boosts: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Row-wise ``calculate_risk_score``. ``message_counts`` feeds the short
+    conversation multiplier; when ``boosts`` (the summed analyzer boosts) is
+    given the result is ``min(1, score + boost)`` like the analyze endpoint.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    message_counts = np.asarray(message_counts)
+    present = counts > 0
+
+    # Accumulate column by column: the same additions, in the same order, as
+    # the scalar loop (absent flags add an exact 0.0)
+    saturation = np.minimum(counts / 3, 1.0)
+    base = np.zeros(counts.shape[0])
+    for col in range(counts.shape[1]):
+        base += FLAG_WEIGHTS[col] * saturation[:, col]
+
+    # Context multipliers
+    love_bombing = present[:, FLAG_COLUMNS['love_bombing']]
+    base = np.where((message_counts < 10) & love_bombing, base * 1.3, base)
+    financial_count = counts[:, _FINANCIAL].sum(axis=1)
+    base = np.where(financial_count > 2, base * 1.4, base)
+
+    # Combo boosters
+    time_pressure = present[:, FLAG_COLUMNS['time_pressure']]
+    fee = _any(present, ['registration_fee', 'activation_fee'])
+    base = np.where(
+        _any(present, ['direct_money_request', 'gift_card_request', 'crypto_wallet']) & time_pressure,
+        base + 0.25, base)
+    base = np.where(
+        _any(present, ['guaranteed_profit_daily', 'investment_scheme'])
+        & _any(present, ['exchange_deposit', 'minimum_deposit'])
+        & present[:, FLAG_COLUMNS['follow_orders']],
+        base + 0.3, base)
+    base = np.where(present[:, FLAG_COLUMNS['earn_per_day']] & fee & time_pressure, base + 0.28, base)
+    base = np.where(
+        present[:, FLAG_COLUMNS['document_request']]
+        & _any(present, ['registration_fee', 'activation_fee', 'fees_documents']),
+        base + 0.2, base)
+
+    scores = np.minimum(np.maximum(base, 0.0), 1.0)
+    if boosts is not None:
+        scores = np.minimum(1.0, scores + np.asarray(boosts, dtype=np.float64))
+    return scores
+
+
+def batch_risk_tiers(scores: np.ndarray, counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Row-wise ``determine_risk_tier`` for final scores and the flag counts the
+    red-flag list was built from. Returns ``tier`` (strings) and
+    ``confidence`` arrays.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    present = np.asarray(counts) > 0
+    n_flags = present.sum(axis=1)
+
+    tier = np.where(scores >= 0.8, HIGH, np.where(scores >= 0.5, MEDIUM, LOW))
+
+    n_severe = present[:, _SEVERE].sum(axis=1)
+    tier = np.where((n_severe >= 2) & (tier == MEDIUM), HIGH, tier)
+
+    has_financial = present[:, _FINANCIAL].any(axis=1)
+    demote = (tier == HIGH) & (((n_flags == 1) & (scores < 0.9)) | (~has_financial & (scores < 0.85)))
+    tier = np.where(demote, MEDIUM, tier)
+
+    n_categories = (present.astype(np.int64) @ _CATEGORY_MAP.astype(np.int64) > 0).sum(axis=1)
+    time_pressure = present[:, FLAG_COLUMNS['time_pressure']]
+    upfront_fee = _any(present, ['registration_fee', 'activation_fee', 'minimum_deposit'])
+
+    # Rule 1: Investment fraud pattern (deposit + obedience) raises one tier
+    rule = present[:, FLAG_COLUMNS['investment_scheme']] & _any(present, ['exchange_deposit', 'follow_orders'])
+    tier = np.where(rule & (tier < HIGH), tier + 1, tier)
+
+    # Rule 2: Multiple categories = cross-cutting manipulation
+    wide = (n_categories >= 3) & (scores >= 0.4)
+    tier = np.where(wide, HIGH, tier)
+    tier = np.where(~wide & (n_categories >= 2) & (scores >= 0.5) & (tier == LOW), MEDIUM, tier)
+
+    # Rule 3: Upfront fee + time pressure
+    tier = np.where(upfront_fee & time_pressure & (tier == LOW), MEDIUM, tier)
+
+    # Rule 4: Money + urgency + untraceable method
+    rule = _any(present, ['direct_money_request', 'gift_card_request', 'crypto_wallet']) & time_pressure
+    tier = np.where(rule & (scores >= 0.5), HIGH, tier)
+    tier = np.where(rule & (scores < 0.5) & (tier == LOW), MEDIUM, tier)
+
+    # Rule 5: Guaranteed profit + upfront fee (+ document = compound fraud)
+    rule = _any(present, ['guaranteed_profit_daily', 'earn_per_day']) & upfront_fee
+    document = present[:, FLAG_COLUMNS['document_request']]
+    tier = np.where(rule & document, HIGH, tier)
+    tier = np.where(rule & ~document & (tier == LOW), MEDIUM, tier)
+
+    # Rule 6: Severe financial flag + behavioral manipulation
+    severe_financial = present[:, _SEVERE & _FINANCIAL].any(axis=1)
+    behavioral = present[:, _BEHAVIORAL].any(axis=1)
+    tier = np.where(severe_financial & behavioral & (scores >= 0.5) & (tier == MEDIUM), HIGH, tier)
+
+    return {
+        'tier': TIERS[tier],
+        'confidence': np.minimum(1.0, 0.5 + 0.5 * scores + 0.05 * n_flags),
+    }
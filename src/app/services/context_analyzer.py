@@ -1,9 +1,23 @@
-from typing import Dict, List
-from datetime import datetime
-import re
+from typing import Dict, List, Optional
 
+from .features import MessageFeatures, extract_features, register_lexicon
 
-def analyze_conversation_context(messages: List[Dict]) -> Dict:
+
+FINANCIAL_KEYWORDS = [
+    'money', 'cash', 'send', 'transfer', 'pay', 'fee', 'dollars', '$',
+    '돈', '송금', '입금', '보내', '비용', '수수료', 'gift card', 'bitcoin'
+]
+
+LOVE_KEYWORDS = [
+    'love', 'soul', 'destiny', 'marry', 'future', 'forever',
+    '사랑', '운명', '결혼', '미래', 'soulmate'
+]
+
+register_lexicon('context:financial', FINANCIAL_KEYWORDS)
+register_lexicon('context:love', LOVE_KEYWORDS)
+
+
+def analyze_conversation_context(messages: List[Dict], features: Optional[List[MessageFeatures]] = None) -> Dict:
     """
     Analyze temporal patterns, topic shifts, and emotional manipulation in conversation flow.
     """
@@ -16,8 +30,10 @@ def analyze_conversation_context(messages: List[Dict]) -> Dict:
             'suspicion_signals': []
         }
     
-    time_pattern = _analyze_time_intervals(messages)
-    topic_shift = _detect_topic_shifts(messages)
+    if features is None:
+        features = extract_features(messages)
+    time_pattern = _analyze_time_intervals(features)
+    topic_shift = _detect_topic_shifts(features)
     relationship_stage = _determine_relationship_stage(messages)
     suspicion_signals = []
     
@@ -54,17 +70,14 @@ def analyze_conversation_context(messages: List[Dict]) -> Dict:
     }
 
 
-def _analyze_time_intervals(messages: List[Dict]) -> Dict:
+def _analyze_time_intervals(features: List[MessageFeatures]) -> Dict:
     """
     Analyze time gaps between messages.
     """
     intervals = []
-    for i in range(1, len(messages)):
+    for prev, curr in zip(features, features[1:]):
         try:
-            prev_ts = datetime.fromisoformat(messages[i-1].get('timestamp', '1970-01-01T00:00:00Z').replace('Z', '+00:00'))
-            curr_ts = datetime.fromisoformat(messages[i].get('timestamp', '1970-01-01T00:00:00Z').replace('Z', '+00:00'))
-            gap_seconds = (curr_ts - prev_ts).total_seconds()
-            intervals.append(gap_seconds)
+            intervals.append((curr.ts - prev.ts).total_seconds())
         except Exception:
             continue
     
@@ -82,34 +95,18 @@ def _analyze_time_intervals(messages: List[Dict]) -> Dict:
     }
 
 
-def _detect_topic_shifts(messages: List[Dict]) -> Dict:
+def _detect_topic_shifts(features: List[MessageFeatures]) -> Dict:
     """
     Detect shifts from casual to financial topics.
     """
-    financial_keywords = [
-        'money', 'cash', 'send', 'transfer', 'pay', 'fee', 'dollars', '$',
-        '돈', '송금', '입금', '보내', '비용', '수수료', 'gift card', 'bitcoin'
-    ]
-    
-    love_keywords = [
-        'love', 'soul', 'destiny', 'marry', 'future', 'forever',
-        '사랑', '운명', '결혼', '미래', 'soulmate'
-    ]
-    
     first_money_turn = None
     first_love_turn = None
     prev_topic = None
     abrupt_shift = False
     
-    for i, msg in enumerate(messages):
-        # Handle both dict and Pydantic model
-        if hasattr(msg, 'content'):
-            content = msg.content.lower()
-        else:
-            content = (msg.get('content') or msg.get('text') or '').lower()
-        
-        has_money = any(kw in content for kw in financial_keywords)
-        has_love = any(kw in content for kw in love_keywords)
+    for i, feat in enumerate(features):
+        has_money = feat.has('context:financial')
+        has_love = feat.has('context:love')
         
         current_topic = None
         if has_money:
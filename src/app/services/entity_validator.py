@@ -1,11 +1,49 @@
-from typing import Dict, List, Set
+from typing import Dict, List, Optional
 import re
 
+from .features import MessageFeatures, extract_features, register_lexicon, register_pattern
 
-def extract_entities(messages: List[Dict]) -> Dict:
+
+# Self-introduced names (simple heuristic), with the literals every match starts with
+NAME_PATTERNS = [
+    (r"(?:my name is|i'm|i am|call me)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)", ["my name is", "i'm", "i am", "call me"]),
+    (r"(?:제 이름은|저는)\s+([가-힣]{2,4})", ['제 이름은', '저는']),
+]
+
+LOCATION_PATTERNS = [
+    (r"(?:in|from|live in|based in)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)", ['in', 'from', 'live in', 'based in']),
+    (r"(?:에 살아|에서 왔어|거주)\s+([가-힣]{2,10})", ['에 살아', '에서 왔어', '거주']),
+]
+
+# Unlike the patterns above, an age match starts before its anchor
+AGE_PATTERN = (r"\b(\d{2})\s*(?:years old|year old|살|세)\b", ['years old', 'year old', '살', '세'])
+
+OCCUPATION_KEYWORDS = [
+    'engineer', 'doctor', 'surgeon', 'soldier', 'military', 'oil rig', 'contractor',
+    'businessman', 'CEO', 'manager', '엔지니어', '의사', '군인', '사업가'
+]
+
+FAMILY_KEYWORDS = ['mother', 'father', 'grandmother', 'son', 'daughter', 'wife', 'husband',
+                   '엄마', '아빠', '할머니', '아들', '딸', '아내', '남편']
+
+_NAME_KEYS = [f'entity:name:{i}' for i in range(len(NAME_PATTERNS))]
+_LOCATION_KEYS = [f'entity:location:{i}' for i in range(len(LOCATION_PATTERNS))]
+
+for _key, (_pattern, _anchors) in zip(_NAME_KEYS, NAME_PATTERNS):
+    register_pattern(_key, _pattern, re.IGNORECASE, _anchors, anchored_start=True)
+for _key, (_pattern, _anchors) in zip(_LOCATION_KEYS, LOCATION_PATTERNS):
+    register_pattern(_key, _pattern, re.IGNORECASE, _anchors, anchored_start=True)
+register_pattern('entity:age', AGE_PATTERN[0], re.IGNORECASE, AGE_PATTERN[1])
+register_lexicon('entity:occupation', [occ.lower() for occ in OCCUPATION_KEYWORDS])
+register_lexicon('entity:family', [fam.lower() for fam in FAMILY_KEYWORDS])
+
+
+def extract_entities(messages: List[Dict], features: Optional[List[MessageFeatures]] = None) -> Dict:
     """
     Extract named entities (names, locations, occupations, ages) from conversation.
     """
+    if features is None:
+        features = extract_features(messages)
     entities = {
         'names': set(),
         'locations': set(),
@@ -14,60 +52,27 @@ def extract_entities(messages: List[Dict]) -> Dict:
         'family_mentions': set(),
     }
     
-    for msg in messages:
-        # Handle both dict and Pydantic model
-        if hasattr(msg, 'content'):
-            content = msg.content
-        else:
-            content = msg.get('content') or msg.get('text') or ''
-        
-        # Extract self-introduced names (simple heuristic)
-        name_patterns = [
-            r"(?:my name is|i'm|i am|call me)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)",
-            r"(?:제 이름은|저는)\s+([가-힣]{2,4})",
-        ]
-        for pattern in name_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            entities['names'].update(m.strip() for m in matches if m)
-        
-        # Extract locations
-        location_patterns = [
-            r"(?:in|from|live in|based in)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)",
-            r"(?:에 살아|에서 왔어|거주)\s+([가-힣]{2,10})",
-        ]
-        for pattern in location_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            entities['locations'].update(m.strip() for m in matches if m)
-        
-        # Extract occupations
-        occupation_keywords = [
-            'engineer', 'doctor', 'surgeon', 'soldier', 'military', 'oil rig', 'contractor',
-            'businessman', 'CEO', 'manager', '엔지니어', '의사', '군인', '사업가'
-        ]
-        for occ in occupation_keywords:
-            if occ.lower() in content.lower():
-                entities['occupations'].add(occ.lower())
-        
-        # Extract ages
-        age_pattern = r"\b(\d{2})\s*(?:years old|year old|살|세)\b"
-        age_matches = re.findall(age_pattern, content, re.IGNORECASE)
-        entities['ages'].update(age_matches)
+    for feat in features:
+        if feat.regex:
+            for key in _NAME_KEYS:
+                entities['names'].update(m.group(1).strip() for m in feat.matches(key) if m.group(1))
+            
+            for key in _LOCATION_KEYS:
+                entities['locations'].update(m.group(1).strip() for m in feat.matches(key) if m.group(1))
+            
+            entities['ages'].update(m.group(1) for m in feat.matches('entity:age'))
         
-        # Extract family mentions
-        family_keywords = ['mother', 'father', 'grandmother', 'son', 'daughter', 'wife', 'husband', 
-                          '엄마', '아빠', '할머니', '아들', '딸', '아내', '남편']
-        for fam in family_keywords:
-            if fam.lower() in content.lower():
-                entities['family_mentions'].add(fam.lower())
+        entities['occupations'].update(feat.hits('entity:occupation'))
+        entities['family_mentions'].update(feat.hits('entity:family'))
     
     return {k: list(v) for k, v in entities.items()}
 
 
-def detect_inconsistencies(messages: List[Dict]) -> Dict:
+def detect_inconsistencies(messages: List[Dict], features: Optional[List[MessageFeatures]] = None) -> Dict:
     """
     Detect contradictions in self-reported information across messages.
     """
-    entities = extract_entities(messages)
+    entities = extract_entities(messages, features)
     inconsistencies = []
     
     # Check for multiple names
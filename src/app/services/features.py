@@ -0,0 +1,227 @@
+"""
+Shared per-message feature extraction.
+
+Analyzers register their keyword lexicons and regexes here at import time. All
+lexicons are compiled into one keyword automaton, so a message is lowercased and
+scanned once no matter how many analyzers read it. Regexes may declare literal
+``anchors`` (lowercase); they then only run when one of the anchors was seen by
+the same scan. Patterns whose every match begins with one of their anchors are
+only tried at the offsets where the scan found one.
+"""
+
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+import re
+import threading
+
+from ..utils.keyword_automaton import KeywordAutomaton
+
+
+DEFAULT_TIMESTAMP = '1970-01-01T00:00:00Z'
+
+EMOJI_PATTERN = re.compile(r'[\U0001F300-\U0001F9FF]|[❤️😊😍🥰💕💖]')
+
+# Characters that re.IGNORECASE folds onto ASCII letters but str.lower() does not;
+# when present, anchors are not a safe prefilter and every regex runs.
+_CASE_EQUIVALENTS = re.compile('[İıſ]')
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+class MessageFeatures(NamedTuple):
+    turn: int
+    sender: str
+    content: str
+    lowered: str
+    timestamp: Optional[str]
+    ts: Optional[datetime]
+    keywords: Dict[str, Set[str]]
+    keyword_spans: Tuple[Tuple[int, int, str, Tuple[str, ...]], ...]
+    regex: Dict[str, List[re.Match]]
+    emoji_count: int
+    exclamation_count: int
+
+    def hits(self, lexicon: str) -> Set[str]:
+        """Distinct keywords of a lexicon found in this message."""
+        return self.keywords.get(lexicon, _EMPTY)
+
+    def has(self, lexicon: str) -> bool:
+        return lexicon in self.keywords
+
+    def matches(self, pattern: str) -> List[re.Match]:
+        """Matches of a registered regex on the original content."""
+        return self.regex.get(pattern, [])
+
+
+_LEXICONS: Dict[str, Tuple[str, ...]] = {}
+_PATTERNS: Dict[str, Tuple[re.Pattern, Tuple[str, ...], bool]] = {}
+_registry_lock = threading.Lock()
+_compiled = None
+
+
+def register_lexicon(name: str, keywords: Iterable[str]) -> None:
+    """
+    Register (or replace) a keyword lexicon. Keywords are matched literally
+    against the lowercased message; duplicates count once.
+    """
+    global _compiled
+    with _registry_lock:
+        _LEXICONS[name] = tuple(dict.fromkeys(keywords))
+        _compiled = None
+
+
+def register_pattern(
+    name: str,
+    pattern: str,
+    flags: int = 0,
+    anchors: Optional[Iterable[str]] = None,
+    anchored_start: bool = False,
+) -> None:
+    """
+    Register (or replace) a regex run on the original message content.
+    With ``anchored_start`` every match must begin with one of the anchors.
+    """
+    global _compiled
+    anchors = tuple(anchors or ())
+    if anchored_start and not anchors:
+        raise ValueError('anchored_start requires anchors')
+    with _registry_lock:
+        _PATTERNS[name] = (re.compile(pattern, flags), anchors, anchored_start)
+        _compiled = None
+
+
+def _compile():
+    automaton = KeywordAutomaton()
+    keyword_lexicons: Dict[str, List[str]] = {}
+    keyword_patterns: Dict[str, List[str]] = {}
+    for name, keywords in _LEXICONS.items():
+        for kw in keywords:
+            keyword_lexicons.setdefault(kw, []).append(name)
+    for name, (_, anchors, _) in _PATTERNS.items():
+        for anchor in anchors:
+            keyword_patterns.setdefault(anchor, []).append(name)
+    # payloads[kid] = (keyword, lexicons, anchored patterns)
+    payloads = []
+    for kw in dict.fromkeys(list(keyword_lexicons) + list(keyword_patterns)):
+        automaton.add(kw)
+        payloads.append((kw, tuple(keyword_lexicons.get(kw, ())), tuple(keyword_patterns.get(kw, ()))))
+    automaton.build()
+    patterns = {name: (compiled, prefix) for name, (compiled, _, prefix) in _PATTERNS.items()}
+    unanchored = [name for name, (_, anchors, _) in _PATTERNS.items() if not anchors]
+    return automaton, payloads, patterns, unanchored
+
+
+def _get_compiled():
+    global _compiled
+    compiled = _compiled
+    if compiled is None:
+        with _registry_lock:
+            if _compiled is None:
+                _compiled = _compile()
+            compiled = _compiled
+    return compiled
+
+
+def compile_registry() -> None:
+    """
+    Build the shared automaton now instead of on the first request.
+    """
+    _get_compiled()
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except Exception:
+        return None
+
+
+def extract_message_features(msg, turn: int = 0) -> MessageFeatures:
+    """
+    Build the feature record for one message (dict or Pydantic model).
+    """
+    if hasattr(msg, 'content'):
+        content = msg.content or ''
+        sender = msg.sender
+        timestamp = msg.timestamp
+    else:
+        content = msg.get('content') or msg.get('text') or ''
+        sender = msg.get('sender', 'contact')
+        timestamp = msg.get('timestamp', DEFAULT_TIMESTAMP)
+
+    automaton, payloads, patterns, unanchored = _get_compiled()
+    lowered = content.lower()
+
+    keywords: Dict[str, Set[str]] = {}
+    spans = []
+    anchored: Dict[str, List[int]] = {}
+    for start, end, kid in automaton.findall(lowered):
+        kw, lexicons, pattern_names = payloads[kid]
+        for name in pattern_names:
+            starts = anchored.get(name)
+            if starts is None:
+                anchored[name] = [start]
+            else:
+                starts.append(start)
+        if lexicons:
+            spans.append((start, end, kw, lexicons))
+            for name in lexicons:
+                found = keywords.get(name)
+                if found is None:
+                    keywords[name] = {kw}
+                else:
+                    found.add(kw)
+
+    regex: Dict[str, List[re.Match]] = {}
+    if _CASE_EQUIVALENTS.search(content) is not None:
+        to_run = [(name, None) for name in patterns]
+    else:
+        to_run = [(name, None) for name in unanchored]
+        to_run.extend(anchored.items())
+    # Anchor offsets come from the lowercased text; only reuse them on content
+    # when lowercasing kept every character in place.
+    same_offsets = len(lowered) == len(content)
+    for name, starts in to_run:
+        pattern, prefix = patterns[name]
+        if starts is not None and prefix and same_offsets:
+            found = _match_at(pattern, content, starts)
+        else:
+            found = list(pattern.finditer(content))
+        if found:
+            regex[name] = found
+
+    return MessageFeatures(
+        turn,
+        sender,
+        content,
+        lowered,
+        timestamp,
+        parse_timestamp(timestamp),
+        keywords,
+        tuple(spans),
+        regex,
+        0 if content.isascii() else len(EMOJI_PATTERN.findall(content)),
+        content.count('!'),
+    )
+
+
+def _match_at(pattern: re.Pattern, content: str, starts: List[int]) -> List[re.Match]:
+    # Same result as finditer when every match begins at one of the starts
+    found = []
+    last_end = 0
+    for pos in sorted(set(starts)):
+        if pos < last_end:
+            continue
+        m = pattern.match(content, pos)
+        if m:
+            found.append(m)
+            last_end = m.end()
+    return found
+
+
+def extract_features(messages: List[Dict]) -> List[MessageFeatures]:
+    """
+    Featurize a conversation once; every analyzer accepts the result via its
+    ``features`` argument.
+    """
+    return [extract_message_features(msg, i) for i, msg in enumerate(messages)]
@@ -1,6 +1,8 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 import re
 
+from .features import MessageFeatures, extract_features, register_pattern
+
 
 # Currency normalization
 CURRENCY_PATTERNS = {
@@ -13,24 +15,41 @@ CURRENCY_PATTERNS = {
 }
 
 
-def extract_money_amounts(messages: List[Dict]) -> List[Dict]:
+# Literals each currency pattern needs before it can match
+CURRENCY_ANCHORS = {
+    'usd': ['$'],
+    'krw': ['원', 'won'],
+    'eur': ['€'],
+    'gbp': ['£'],
+    'cny': ['¥'],
+    'generic': ['dollar', 'buck', 'euro', 'pound'],
+}
+
+# Symbol-prefixed amounts always start at their currency sign
+_SIGN_PREFIXED = {'usd', 'eur', 'gbp', 'cny'}
+
+_CURRENCY_KEYS = [(currency, f'money:{currency}') for currency in CURRENCY_PATTERNS]
+
+for _currency, _key in _CURRENCY_KEYS:
+    register_pattern(_key, CURRENCY_PATTERNS[_currency], re.IGNORECASE, CURRENCY_ANCHORS[_currency],
+                     anchored_start=_currency in _SIGN_PREFIXED)
+
+
+def extract_money_amounts(messages: List[Dict], features: Optional[List[MessageFeatures]] = None) -> List[Dict]:
     """
     Extract all money mentions with normalized amounts in USD.
     """
+    if features is None:
+        features = extract_features(messages)
     amounts = []
     
-    for i, msg in enumerate(messages):
-        # Handle both dict and Pydantic model
-        if hasattr(msg, 'content'):
-            content = msg.content
-            sender = msg.sender
-        else:
-            content = msg.get('content') or msg.get('text') or ''
-            sender = msg.get('sender', 'contact')
-        
-        for currency, pattern in CURRENCY_PATTERNS.items():
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches:
+    for i, feat in enumerate(features):
+        if not feat.regex:
+            continue
+        sender = feat.sender
+        for currency, key in _CURRENCY_KEYS:
+            for m in feat.matches(key):
+                match = m.group(1)
                 # Remove commas and convert to float
                 clean_amount = match.replace(',', '')
                 try:
@@ -95,11 +114,11 @@ def detect_escalation_pattern(amounts: List[Dict]) -> Dict:
     }
 
 
-def analyze_money_patterns(messages: List[Dict]) -> Dict:
+def analyze_money_patterns(messages: List[Dict], features: Optional[List[MessageFeatures]] = None) -> Dict:
     """
     Comprehensive money pattern analysis.
     """
-    amounts = extract_money_amounts(messages)
+    amounts = extract_money_amounts(messages, features)
     escalation = detect_escalation_pattern(amounts)
     
     suspicion_signals = []
@@ -1,6 +1,8 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 import re
 
+from .features import MessageFeatures, extract_features, extract_message_features, register_lexicon, register_pattern
+
 
 RED_FLAG_PATTERNS = {
     'financial': {
@@ -18,6 +20,8 @@ RED_FLAG_PATTERNS = {
         },
         'crypto_wallet': {
             'regex': r'\b(0x[a-fA-F0-9]{40}|bc1[a-z0-9]{39,59})\b',
+            'anchors': ['0x', 'bc1'],
+            'anchored_start': True,
             'weight': 0.4
         },
         'investment_scheme': {
@@ -38,6 +42,8 @@ RED_FLAG_PATTERNS = {
         },
         'minimum_deposit': {
             'regex': r'(start|begin|minimum|min)\s+(with|deposit|amount)?\s*\$?\d+',
+            'anchors': ['start', 'begin', 'min'],
+            'anchored_start': True,
             'weight': 0.3
         },
         'registration_fee': {
@@ -53,6 +59,8 @@ RED_FLAG_PATTERNS = {
         },
         'earn_per_day': {
             'regex': r'(earn|make|get)\s*\$?\d+\s*[/-]\s*(day|daily|per day)',
+            'anchors': ['earn', 'make', 'get'],
+            'anchored_start': True,
             'weight': 0.35
         },
         'fees_documents': {
@@ -158,37 +166,101 @@ RED_FLAG_PATTERNS = {
         },
         'phishing_link': {
             'regex': r'(bit\.ly|goo\.gl|tinyurl|[a-z0-9-]+\.(kr|com)/[a-z0-9-]{6,})',
+            'anchors': ['bit.ly', 'goo.gl', 'tinyurl', '.kr/', '.com/'],
             'weight': 0.4
         }
     }
 }
 
 
-def detect_red_flags(messages: List[Dict]) -> Dict:
+def _register_red_flags():
+    """
+    Register every flag with the shared feature extractor. Flags are numbered
+    in declaration order so detection reports them in the same order the
+    per-flag loop used to. A regex flag may list ``anchors``: lowercase
+    literals one of which must occur for the regex to match (and, with
+    ``anchored_start``, that every match starts with).
+    """
+    flag_ids = []
+    for category, flags in RED_FLAG_PATTERNS.items():
+        for flag, spec in flags.items():
+            flag_ids.append((category, flag))
+            if 'keywords' in spec:
+                register_lexicon(RED_FLAG_PREFIX + flag, spec['keywords'])
+            if 'regex' in spec:
+                register_pattern(RED_FLAG_PREFIX + flag, spec['regex'], re.IGNORECASE, spec.get('anchors'),
+                                 anchored_start=spec.get('anchored_start', False))
+    return flag_ids
+
+
+RED_FLAG_PREFIX = 'red_flag:'
+FLAG_IDS = _register_red_flags()
+_FLAG_INDEX = {RED_FLAG_PREFIX + flag: fid for fid, (_, flag) in enumerate(FLAG_IDS)}
+
+# Flags reported with 'severe' severity; every other flag is 'moderate'
+SEVERE_FLAGS = {('financial', 'direct_money_request'), ('financial', 'gift_card_request')}
+
+
+def flag_severity(category: str, flag: str) -> str:
+    return 'severe' if (category, flag) in SEVERE_FLAGS else 'moderate'
+
+
+def find_red_flag_hits(content: str) -> List[Dict]:
+    """
+    Return every red-flag hit in one message as dicts with category, flag,
+    matched text and offsets. Keyword offsets refer to ``content.lower()``;
+    regex offsets refer to ``content``.
+    """
+    feat = extract_message_features({'content': content})
+    hits = []
+    for start, end, keyword, lexicons in feat.keyword_spans:
+        for name in lexicons:
+            fid = _FLAG_INDEX.get(name)
+            if fid is not None:
+                category, flag = FLAG_IDS[fid]
+                hits.append({'category': category, 'flag': flag, 'match': keyword, 'start': start, 'end': end})
+    for name, found in feat.regex.items():
+        fid = _FLAG_INDEX.get(name)
+        if fid is not None:
+            category, flag = FLAG_IDS[fid]
+            m = found[0]
+            hits.append({'category': category, 'flag': flag, 'match': m.group(0), 'start': m.start(), 'end': m.end()})
+    return hits
+
+
+def _count_flags(feat: MessageFeatures) -> Dict[int, int]:
+    # Each distinct keyword counts once, a matching regex adds one
+    counts: Dict[int, int] = {}
+    for name, keywords in feat.keywords.items():
+        fid = _FLAG_INDEX.get(name)
+        if fid is not None:
+            counts[fid] = len(keywords)
+    for name in feat.regex:
+        fid = _FLAG_INDEX.get(name)
+        if fid is not None:
+            counts[fid] = counts.get(fid, 0) + 1
+    return counts
+
+
+def detect_red_flags(messages: List[Dict], features: Optional[List[MessageFeatures]] = None) -> Dict:
+    if features is None:
+        features = extract_features(messages)
     detected: Dict[str, Dict[str, Dict[str, int]]] = {}
-    for idx, msg in enumerate(messages):
-        content = msg.get('content') or msg.get('text') or ''
-        lowered = content.lower()
-        for category, flags in RED_FLAG_PATTERNS.items():
-            for flag, spec in flags.items():
-                count = 0
-                if 'keywords' in spec:
-                    for kw in spec['keywords']:
-                        if kw in lowered:
-                            count += 1
-                if 'regex' in spec:
-                    if re.search(spec['regex'], content, flags=re.IGNORECASE):
-                        count += 1
-                if count > 0:
-                    detected.setdefault(category, {}).setdefault(flag, {"count": 0})
-                    detected[category][flag]["count"] += count
+    for feat in features:
+        counts = _count_flags(feat)
+        for fid in sorted(counts):
+            category, flag = FLAG_IDS[fid]
+            detected.setdefault(category, {}).setdefault(flag, {"count": 0})
+            detected[category][flag]["count"] += counts[fid]
     return detected
 
 
 def calculate_risk_score(detected_flags: Dict, conversation_context: Dict) -> float:
+    # Sum in declaration order so the batch scorer reproduces the same floats
     base_score = 0.0
-    for category, flags in detected_flags.items():
-        for flag, details in flags.items():
+    for category, flag in FLAG_IDS:
+        details = detected_flags.get(category, {}).get(flag)
+        if details:
             weight = RED_FLAG_PATTERNS[category][flag]['weight']
             frequency = details['count']
             base_score += weight * min(frequency / 3, 1.0)
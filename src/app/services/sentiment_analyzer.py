@@ -1,5 +1,6 @@
-from typing import Dict, List
-import re
+from typing import Dict, List, Optional
+
+from .features import MessageFeatures, extract_features, register_lexicon
 
 
 # Emotional manipulation patterns
@@ -42,52 +43,53 @@ DESPERATION_KEYWORDS = [
 ]
 
 
-def analyze_emotional_manipulation(messages: List[Dict]) -> Dict:
+register_lexicon('sentiment:guilt_trip', GUILT_TRIP_PATTERNS)
+register_lexicon('sentiment:isolation', ISOLATION_PATTERNS)
+register_lexicon('sentiment:love_intensity', LOVE_INTENSITY_KEYWORDS)
+register_lexicon('sentiment:desperation', DESPERATION_KEYWORDS)
+
+
+def analyze_emotional_manipulation(messages: List[Dict], features: Optional[List[MessageFeatures]] = None) -> Dict:
     """
     Detect guilt-tripping, isolation attempts, and emotional intensity patterns.
     """
+    if features is None:
+        features = extract_features(messages)
     guilt_trips = []
     isolation_attempts = []
     love_intensity_by_turn = []
     desperation_count = 0
     
-    for i, msg in enumerate(messages):
-        # Handle both dict and Pydantic model
-        if hasattr(msg, 'content'):
-            content = msg.content
-            sender = msg.sender
-        else:
-            content = msg.get('content') or msg.get('text') or ''
-            sender = msg.get('sender', 'contact')
-        
-        lowered = content.lower()
-        
+    for i, feat in enumerate(features):
         # Detect guilt-tripping
-        for pattern in GUILT_TRIP_PATTERNS:
-            if pattern in lowered:
-                guilt_trips.append({
-                    'turn': i,
-                    'sender': sender,
-                    'pattern': pattern,
-                    'text': content[:100]
-                })
+        found = feat.hits('sentiment:guilt_trip')
+        if found:
+            for pattern in GUILT_TRIP_PATTERNS:
+                if pattern in found:
+                    guilt_trips.append({
+                        'turn': i,
+                        'sender': feat.sender,
+                        'pattern': pattern,
+                        'text': feat.content[:100]
+                    })
         
         # Detect isolation attempts
-        for pattern in ISOLATION_PATTERNS:
-            if pattern in lowered:
-                isolation_attempts.append({
-                    'turn': i,
-                    'sender': sender,
-                    'pattern': pattern,
-                    'text': content[:100]
-                })
+        found = feat.hits('sentiment:isolation')
+        if found:
+            for pattern in ISOLATION_PATTERNS:
+                if pattern in found:
+                    isolation_attempts.append({
+                        'turn': i,
+                        'sender': feat.sender,
+                        'pattern': pattern,
+                        'text': feat.content[:100]
+                    })
         
         # Measure love intensity per turn
-        love_score = sum(1 for kw in LOVE_INTENSITY_KEYWORDS if kw in lowered)
-        love_intensity_by_turn.append(love_score)
+        love_intensity_by_turn.append(len(feat.hits('sentiment:love_intensity')))
         
         # Desperation count
-        if any(kw in lowered for kw in DESPERATION_KEYWORDS):
+        if feat.has('sentiment:desperation'):
             desperation_count += 1
     
     # Calculate love bombing intensity (early messages with high love score)
@@ -1,5 +1,6 @@
-from typing import Dict, List
-import re
+from typing import Dict, List, Optional
+
+from .features import MessageFeatures, extract_features, register_lexicon
 
 
 # Define typical scam sequence stages
@@ -27,26 +28,31 @@ SCAM_SEQUENCE_STAGES = {
 }
 
 
-def detect_scam_sequence(messages: List[Dict]) -> Dict:
+_STAGE_KEYS = [(stage_name, f'sequence:{stage_name}') for stage_name in SCAM_SEQUENCE_STAGES]
+
+for _stage_name, _key in _STAGE_KEYS:
+    register_lexicon(_key, SCAM_SEQUENCE_STAGES[_stage_name]['keywords'])
+
+
+def detect_scam_sequence(messages: List[Dict], features: Optional[List[MessageFeatures]] = None) -> Dict:
     """
     Detect if conversation follows typical romance scam sequence pattern.
     """
-    detected_stages = {}
+    if features is None:
+        features = extract_features(messages)
+    first_occurrences = {}
+    for i, feat in enumerate(features):
+        if not feat.keywords:
+            continue
+        for stage_name, key in _STAGE_KEYS:
+            if stage_name not in first_occurrences and key in feat.keywords:
+                first_occurrences[stage_name] = i
+        if len(first_occurrences) == len(SCAM_SEQUENCE_STAGES):
+            break
     
+    detected_stages = {}
     for stage_name, stage_spec in SCAM_SEQUENCE_STAGES.items():
-        first_occurrence = None
-        
-        for i, msg in enumerate(messages):
-            # Handle both dict and Pydantic model
-            if hasattr(msg, 'content'):
-                content = msg.content.lower()
-            else:
-                content = (msg.get('content') or msg.get('text') or '').lower()
-            
-            if any(kw in content for kw in stage_spec['keywords']):
-                first_occurrence = i
-                break
-        
+        first_occurrence = first_occurrences.get(stage_name)
         if first_occurrence is not None:
             detected_stages[stage_name] = {
                 'turn': first_occurrence,
@@ -1,42 +1,51 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 import re
 from collections import Counter
 
+from .features import MessageFeatures, extract_features, register_pattern
 
-def analyze_language_style(messages: List[Dict]) -> Dict:
+
+# Common non-native grammar patterns, with the literal each match starts with
+GRAMMAR_PATTERNS = [
+    (r'\bam working in\b', 'am working in'),  # "I am working in oil rig" (should be "on an oil rig")
+    (r'\bfor making money\b', 'for making money'),  # "for making money" (awkward)
+    (r'\bplease assistance\b', 'please assistance'),  # word order error
+    (r'\bvery much love you\b', 'very much love you'),  # "very much love you" (should be "love you very much")
+    (r'\bneed help financial\b', 'need help financial'),  # adjective after noun
+    (r'\byou can trust to me\b', 'you can trust to me'),  # "trust to me" (should be "trust me")
+]
+
+register_pattern(
+    'style:grammar',
+    '|'.join(f'(?:{p})' for p, _ in GRAMMAR_PATTERNS),
+    re.IGNORECASE,
+    [anchor for _, anchor in GRAMMAR_PATTERNS],
+    anchored_start=True,
+)
+
+
+def analyze_language_style(messages: List[Dict], features: Optional[List[MessageFeatures]] = None) -> Dict:
     """
     Analyze writing style for bot-like patterns, grammar issues, and copy-paste behavior.
     """
+    if features is None:
+        features = extract_features(messages)
     all_texts = []
     emoji_counts = []
     exclamation_counts = []
     grammar_issues = 0
     
-    for msg in messages:
-        # Handle both dict and Pydantic model
-        if hasattr(msg, 'content'):
-            content = msg.content
-            sender = msg.sender
-        else:
-            content = msg.get('content') or msg.get('text') or ''
-            sender = msg.get('sender', 'contact')
-        
+    for feat in features:
         # Only analyze contact's messages
-        if sender != 'contact':
+        if feat.sender != 'contact':
             continue
         
-        all_texts.append(content)
-        
-        # Count emojis (rough approximation)
-        emoji_count = len(re.findall(r'[\U0001F300-\U0001F9FF]|[❤️😊😍🥰💕💖]', content))
-        emoji_counts.append(emoji_count)
-        
-        # Count exclamation marks
-        exclamation_count = content.count('!')
-        exclamation_counts.append(exclamation_count)
+        all_texts.append(feat.content)
+        emoji_counts.append(feat.emoji_count)
+        exclamation_counts.append(feat.exclamation_count)
         
         # Detect common grammar mistakes (native speaker claims vs actual grammar)
-        if _has_grammar_issues(content):
+        if feat.matches('style:grammar'):
             grammar_issues += 1
     
     # Detect copy-paste / repeated phrases
@@ -62,22 +71,6 @@ def analyze_language_style(messages: List[Dict]) -> Dict:
     }
 
 
-def _has_grammar_issues(text: str) -> bool:
-    """
-    Detect common non-native grammar patterns.
-    """
-    grammar_patterns = [
-        r'\bam working in\b',  # "I am working in oil rig" (should be "on an oil rig")
-        r'\bfor making money\b',  # "for making money" (awkward)
-        r'\bplease assistance\b',  # word order error
-        r'\bvery much love you\b',  # "very much love you" (should be "love you very much")
-        r'\bneed help financial\b',  # adjective after noun
-        r'\byou can trust to me\b',  # "trust to me" (should be "trust me")
-    ]
-    
-    return any(re.search(p, text, re.IGNORECASE) for p in grammar_patterns)
-
-
 def _detect_duplicates(texts: List[str]) -> List[str]:
     """
     Detect repeated phrases (copy-paste behavior).
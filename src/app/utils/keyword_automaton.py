@@ -0,0 +1,146 @@
+from collections import deque
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick multi-pattern matcher.
+
+    Every keyword added with ``add`` is found in a single left-to-right pass over
+    the text, including overlapping keywords and keywords that are prefixes or
+    suffixes of each other. Matching is literal (callers lowercase the text
+    themselves) and works for any script, so Korean and Latin keywords share one
+    automaton.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._delta: List[Dict[str, int]] = []
+        self._keywords: List[str] = []
+        self._values: List[Any] = []
+        self._index: Dict[str, int] = {}
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def add(self, keyword: str, value: Any = None) -> int:
+        """
+        Register a keyword and return its id. Re-adding a keyword returns the
+        existing id and keeps the first value.
+        """
+        if not keyword:
+            raise ValueError('keyword must be a non-empty string')
+        if keyword in self._index:
+            return self._index[keyword]
+
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][ch] = nxt
+            state = nxt
+
+        kid = len(self._keywords)
+        self._keywords.append(keyword)
+        self._values.append(value)
+        self._index[keyword] = kid
+        self._out[state] = self._out[state] + (kid,)
+        self._built = False
+        return kid
+
+    def keyword(self, kid: int) -> str:
+        return self._keywords[kid]
+
+    def value(self, kid: int) -> Any:
+        return self._values[kid]
+
+    def build(self) -> None:
+        """
+        Compute failure links breadth-first and fold them into a complete
+        transition table, so scanning is a single dict lookup per character.
+        States without children share their failure state's table.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        delta: List[Dict[str, int]] = [None] * len(goto)
+        delta[0] = goto[0]
+        queue = deque()
+        for nxt in goto[0].values():
+            fail[nxt] = 0
+            queue.append(nxt)
+
+        while queue:
+            state = queue.popleft()
+            f = fail[state]
+            if goto[state]:
+                table = dict(delta[f])
+                table.update(goto[state])
+                delta[state] = table
+            else:
+                delta[state] = delta[f]
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                fail[nxt] = delta[f].get(ch, 0)
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._delta = delta
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield ``(start, end, keyword_id)`` for every keyword occurrence in text.
+        Matches are produced in order of their end offset.
+        """
+        if not self._built:
+            self.build()
+
+        delta, out, keywords = self._delta, self._out, self._keywords
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            hits = out[state]
+            if hits:
+                end = i + 1
+                for kid in hits:
+                    yield end - len(keywords[kid]), end, kid
+
+    def findall(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Same as ``list(iter_matches(text))``, without the generator overhead.
+        """
+        if not self._built:
+            self.build()
+
+        delta, out, keywords = self._delta, self._out, self._keywords
+        found = []
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for kid in out[state]:
+                    found.append((end - len(keywords[kid]), end, kid))
+        return found
+
+    def matched_ids(self, text: str) -> set:
+        """
+        Return the set of distinct keyword ids that occur in text.
+        """
+        if not self._built:
+            self.build()
+
+        delta, out = self._delta, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
@@ -30,3 +30,39 @@ def test_analyze_low_risk_placeholder():
     assert 'score' in data
 
 
+
+
+def test_analyze_batch_streams_ndjson_with_per_item_errors():
+    import json
+
+    good = {
+        "conversation_id": "c1",
+        "messages": [{"message_id": "m1", "sender": "contact", "content": "please send money today, urgent", "timestamp": "2025-09-30T10:30:00Z"}],
+    }
+    empty = {"conversation_id": "c2", "messages": []}
+    lines = [json.dumps(good), "", "{not json", json.dumps(empty), json.dumps({**good, "conversation_id": "c3"})]
+    resp = client.post('/api/v1/analyze_batch', content="\n".join(lines).encode('utf-8'))
+    assert resp.status_code == 200
+    assert resp.headers['content-type'].startswith('application/x-ndjson')
+
+    items = {item['line']: item for item in map(json.loads, resp.text.splitlines())}
+    assert set(items) == {1, 3, 4, 5}
+    assert items[1]['status'] == 200 and items[1]['conversation_id'] == 'c1'
+    assert items[1]['result'] == client.post('/api/v1/analyze', json=good).json() | {'analysis_metadata': items[1]['result']['analysis_metadata']}
+    assert items[3]['status'] == 422
+    assert items[4]['status'] == 400 and items[4]['conversation_id'] == 'c2'
+    assert items[5]['status'] == 200 and items[5]['conversation_id'] == 'c3'
+
+
+def test_ndjson_reader_splits_chunks_and_skips_long_lines():
+    import asyncio
+    from src.app.routers.analyze import _iter_ndjson_lines
+
+    async def chunks():
+        for chunk in [b'{"a"', b':1}\n{"b":2}\n', b'x' * 50, b'\n{"c"', b':3}']:
+            yield chunk
+
+    async def collect():
+        return [item async for item in _iter_ndjson_lines(chunks(), 20)]
+
+    assert asyncio.run(collect()) == [(1, b'{"a":1}'), (2, b'{"b":2}'), (3, None), (4, b'{"c":3}')]
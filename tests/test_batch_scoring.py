@@ -0,0 +1,51 @@
+import numpy as np
+
+from src.app.services.batch_scoring import batch_risk_scores, batch_risk_tiers, flag_count_matrix
+from src.app.services.risk_engine import FLAG_IDS, calculate_risk_score, determine_risk_tier, flag_severity
+
+
+def _detected_from_row(row):
+    detected = {}
+    for col, count in enumerate(row):
+        if count:
+            category, flag = FLAG_IDS[col]
+            detected.setdefault(category, {})[flag] = {'count': int(count)}
+    return detected
+
+
+def test_batch_scoring_matches_per_conversation_functions():
+    rng = np.random.default_rng(0)
+    n = 3000
+    # Sparse counts so that every combo and escalation rule gets exercised
+    counts = rng.integers(0, 5, size=(n, len(FLAG_IDS))) * (rng.random((n, len(FLAG_IDS))) < 0.12)
+    message_counts = rng.integers(1, 30, size=n)
+    boosts = rng.random(n) * 0.3 * (rng.random(n) < 0.5)
+
+    detections = [_detected_from_row(row) for row in counts]
+    assert np.array_equal(flag_count_matrix(detections), counts)
+
+    base = batch_risk_scores(counts, message_counts)
+    scores = batch_risk_scores(counts, message_counts, boosts)
+    tiers = batch_risk_tiers(scores, counts)
+
+    for i, detected in enumerate(detections):
+        context = {
+            'message_count': int(message_counts[i]),
+            'financial_flags_count': sum(d['count'] for d in detected.get('financial', {}).values()),
+        }
+        expected_base = calculate_risk_score(detected, context)
+        expected_score = min(1.0, expected_base + float(boosts[i]))
+        red_flags_list = [
+            {'type': flag, 'category': category, 'severity': flag_severity(category, flag)}
+            for category, flags in detected.items() for flag in flags
+        ]
+        expected_tier = determine_risk_tier(expected_score, red_flags_list)
+
+        assert base[i] == expected_base
+        assert scores[i] == expected_score
+        assert tiers['tier'][i] == expected_tier['tier']
+        assert tiers['confidence'][i] == expected_tier['confidence']
+
+
+def test_flag_count_matrix_handles_no_conversations():
+    assert flag_count_matrix([]).shape == (0, len(FLAG_IDS))
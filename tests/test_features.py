@@ -0,0 +1,54 @@
+import re
+
+from src.app.routers.analyze import Message
+from src.app.services.context_analyzer import analyze_conversation_context
+from src.app.services.entity_validator import detect_inconsistencies
+from src.app.services.features import _match_at, extract_features, register_pattern
+from src.app.services.money_pattern_analyzer import analyze_money_patterns
+from src.app.services.sentiment_analyzer import analyze_emotional_manipulation
+from src.app.services.sequence_analyzer import detect_scam_sequence
+from src.app.services.style_analyzer import analyze_language_style
+
+
+MESSAGES = [
+    {'sender': 'contact', 'content': "Hi, I'm John, 35 years old, from London", 'timestamp': '2024-01-01T10:00:00Z'},
+    {'sender': 'contact', 'content': 'You are my soulmate, I love you so much ❤️', 'timestamp': '2024-01-01T10:01:00Z'},
+    {'sender': 'contact', 'content': "My name is Mike and I'm 42", 'timestamp': '2024-01-01T10:02:00Z'},
+    {'sender': 'contact', 'content': 'Emergency at the hospital, please send $500 then €2000 urgently!!', 'timestamp': '2024-01-01T10:03:00Z'},
+    {'sender': 'contact', 'content': '비트코인 투자 수익 보장, 500만원 입금하세요', 'timestamp': '2024-01-01T10:04:00Z'},
+]
+
+
+def test_analyzers_give_same_result_with_shared_features():
+    features = extract_features(MESSAGES)
+    for analyzer in (
+        analyze_conversation_context,
+        detect_inconsistencies,
+        analyze_emotional_manipulation,
+        analyze_money_patterns,
+        detect_scam_sequence,
+        analyze_language_style,
+    ):
+        assert analyzer(MESSAGES, features) == analyzer(MESSAGES)
+
+
+def test_anchored_patterns_match_like_finditer():
+    pattern = re.compile(r'(?:from|in)\s+([A-Z][a-z]+)', re.IGNORECASE)
+    text = 'I live in Seoul, from Busan originally; in in Daegu'
+    starts = [m.start() for m in re.finditer('from|in', text.lower())]
+    assert [m.span() for m in _match_at(pattern, text, starts)] == [m.span() for m in pattern.finditer(text)]
+
+
+def test_anchored_start_requires_anchors():
+    try:
+        register_pattern('test:bad', r'x', anchored_start=True)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('expected ValueError')
+
+
+def test_time_intervals_read_pydantic_timestamps():
+    messages = [Message(message_id=str(i), **m) for i, m in enumerate(MESSAGES)]
+    result = analyze_conversation_context(messages)
+    assert result['time_pattern']['avg_gap_seconds'] == 60.0
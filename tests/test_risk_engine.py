@@ -0,0 +1,48 @@
+import re
+
+from src.app.services.risk_engine import RED_FLAG_PATTERNS, detect_red_flags, find_red_flag_hits
+from src.app.utils.keyword_automaton import KeywordAutomaton
+
+
+def _legacy_detect_red_flags(messages):
+    detected = {}
+    for msg in messages:
+        content = msg.get('content') or msg.get('text') or ''
+        lowered = content.lower()
+        for category, flags in RED_FLAG_PATTERNS.items():
+            for flag, spec in flags.items():
+                count = sum(1 for kw in spec.get('keywords', []) if kw in lowered)
+                if 'regex' in spec and re.search(spec['regex'], content, flags=re.IGNORECASE):
+                    count += 1
+                if count > 0:
+                    detected.setdefault(category, {}).setdefault(flag, {"count": 0})
+                    detected[category][flag]["count"] += count
+    return detected
+
+
+def test_automaton_finds_overlapping_keywords():
+    ac = KeywordAutomaton()
+    for kw in ['he', 'she', 'his', 'hers', '소액', '소액만']:
+        ac.add(kw)
+    found = sorted((s, e, ac.keyword(k)) for s, e, k in ac.iter_matches('ushers 소액만'))
+    assert found == [(1, 4, 'she'), (2, 4, 'he'), (2, 6, 'hers'), (7, 9, '소액'), (7, 10, '소액만')]
+
+
+def test_detect_red_flags_matches_legacy_counts():
+    messages = [
+        {'content': 'Please send money today, urgent! just $20 to prove you care'},
+        {'content': '거래소에 입금하고 시키는대로 하세요. 수익 보장, 소액만 먼저'},
+        {'content': 'Earn $300/day, pay the registration fee within 1 hour'},
+        {'text': 'start with 100 and check bit.ly/abc123 or https://evil.com/abcdefg'},
+        {'content': 'VIP 방 입장료, wallet 0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb'},
+        {'content': 'ſtart with 50'},
+        {'content': 'How was your day?'},
+    ]
+    assert detect_red_flags(messages) == _legacy_detect_red_flags(messages)
+    assert list(detect_red_flags(messages)) == list(_legacy_detect_red_flags(messages))
+
+
+def test_find_red_flag_hits_reports_offsets():
+    content = 'Please WIRE TRANSFER now'
+    hits = [h for h in find_red_flag_hits(content) if h['flag'] == 'direct_money_request']
+    assert hits == [{'category': 'financial', 'flag': 'direct_money_request', 'match': 'wire transfer', 'start': 7, 'end': 20}]